@@ -6,20 +6,248 @@ Version: 1.0.0
 """
 
 import os
-import logging
-from flask import Flask, jsonify, request, render_template_string
-from datetime import datetime
+
+# Under gunicorn's gevent workers the stdlib must be patched before any other
+# import touches sockets, threads or locks (see gunicorn_conf.py)
+GEVENT_ENABLED = os.environ.get('GEVENT_MONKEY_PATCH', 'False').lower() == 'true'
+if GEVENT_ENABLED:
+    from gevent import monkey
+    monkey.patch_all()
+
+import atexit
 import json
-from functools import wraps
+import logging
+import queue
+import re
+import sys
+from logging.handlers import QueueHandler, QueueListener
+import orjson
+from flask import Flask, Response, request
+from flask_compress import Compress
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+import gzip
+from jinja2 import Environment
+from limits import parse as parse_limit
+from werkzeug.middleware.proxy_fix import ProxyFix
+from importlib.metadata import version as package_version
 import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+class NativeQueueListener(QueueListener):
+    """QueueListener that keeps its worker on an OS thread under gevent"""
+    
+    def start(self):
+        if not GEVENT_ENABLED:
+            return super().start()
+        # A patched threading.Thread is only a greenlet whose stderr writes
+        # would block the hub; the hub's threadpool runs real OS threads
+        import gevent
+        self._thread = gevent.get_hub().threadpool.spawn(self._monitor)
+    
+    def stop(self):
+        if not GEVENT_ENABLED:
+            return super().stop()
+        self.enqueue_sentinel()
+        self._thread.wait()
+        self._thread = None
+
+# Configure logging: handlers only enqueue records, a background listener
+# thread does the formatting and the (blocking) writes to stderr. Like
+# logging.basicConfig() this is skipped when the host already configured the
+# root logger. Under gevent the queue must be the unpatched one, it is
+# shared with an OS thread
+_root_logger = logging.getLogger()
+log_listener = None
+if not _root_logger.handlers:
+    if GEVENT_ENABLED:
+        _log_queue = monkey.get_original('queue', 'SimpleQueue')()
+    else:
+        _log_queue = queue.SimpleQueue()
+    _log_stream = logging.StreamHandler()
+    _log_stream.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    _root_logger.setLevel(logging.INFO)
+    _root_logger.addHandler(QueueHandler(_log_queue))
+    log_listener = NativeQueueListener(_log_queue, _log_stream)
+    log_listener.start()
+    atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# Home page template, compiled once at import with the same autoescaping
+# Flask applies to render_template_string()
+_HOME_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Flask CI/CD Demo App</title>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }
+        .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        .header { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+        .info-box { background-color: #ecf0f1; padding: 15px; border-radius: 5px; margin: 10px 0; }
+        .status-ok { color: #27ae60; font-weight: bold; }
+        .build-info { background-color: #e8f4fd; border-left: 4px solid #3498db; padding: 10px; margin: 10px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1 class="header">🚀 Flask CI/CD Demo Application</h1>
+        <div class="info-box">
+            <h3>Application Status: <span class="status-ok">✅ RUNNING</span></h3>
+            <p><strong>Version:</strong> {{ version }}</p>
+            <p><strong>Environment:</strong> {{ env }}</p>
+            <p><strong>Current Time:</strong> {{ current_time }}</p>
+        </div>
+        
+        <div class="build-info">
+            <h4>Build Information</h4>
+            <p><strong>Build Number:</strong> {{ build_number }}</p>
+            <p><strong>Git Commit:</strong> {{ git_commit }}</p>
+            <p><strong>Host:</strong> {{ host }}:{{ port }}</p>
+        </div>
+        
+        <h3>Available Endpoints:</h3>
+        <ul>
+            <li><code>GET /</code> - This home page</li>
+            <li><code>GET /health</code> - Health check endpoint</li>
+            <li><code>GET /api/status</code> - Application status (JSON)</li>
+            <li><code>GET /api/version</code> - Version information (JSON)</li>
+            <li><code>POST /api/echo</code> - Echo service for testing</li>
+            <li><code>GET /api/metrics</code> - Application metrics</li>
+        </ul>
+    </div>
+</body>
+</html>
+"""
+
+_HOME_TEMPLATE = Environment(autoescape=True).from_string(_HOME_HTML_TEMPLATE)
+
+# Runtime versions reported by /api/version; they cannot change while running
+FLASK_VERSION = package_version('flask')
+
+# /api/metrics is scraped frequently; psutil readings are reused for a short TTL
+METRICS_TTL_SECONDS = float(os.environ.get('METRICS_TTL_SECONDS', 5))
+
+# ISO-8601 timestamp of the current second, shared by every endpoint. The
+# cache is a single tuple so swapping it is atomic under threaded workers too
+_ts_cache = (0, '')
+
+def iso_now():
+    """Return the current UTC time as an ISO-8601 string (second resolution)"""
+    global _ts_cache
+    second, text = _ts_cache
+    now = int(time.time())
+    if now != second:
+        text = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))
+        _ts_cache = (now, text)
+    return text
+
+def json_bytes(obj):
+    """Serialize obj to compact JSON bytes for a prebuilt response body"""
+    return orjson.dumps(obj)
+
+def json_response(obj, status=200):
+    """Build a JSON response without going through jsonify"""
+    try:
+        body = orjson.dumps(obj)
+    except orjson.JSONEncodeError:
+        # e.g. integers wider than 64 bits, which only the stdlib encodes
+        body = json.dumps(obj, separators=(',', ':'), ensure_ascii=False,
+                          allow_nan=False).encode()
+    return Response(body, status=status, mimetype='application/json')
+
+def timestamped_response(body, status=200):
+    """Serve a prebuilt JSON body with its __TS__ placeholder set to now"""
+    return Response(body.replace(b'__TS__', iso_now().encode()), status=status,
+                    mimetype='application/json')
+
+# orjson turns integers outside the 64-bit range into floats; bodies that may
+# hold one (any run of 19+ digits) are parsed with the exact stdlib decoder
+_WIDE_INT = re.compile(rb'-?\d{19,}')
+
+def _reject_constant(name):
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+def parse_json(raw):
+    """Parse a JSON request body, using orjson unless it would lose precision"""
+    if _WIDE_INT.search(raw):
+        # Reject NaN/Infinity like orjson does
+        return json.loads(raw, parse_constant=_reject_constant)
+    return orjson.loads(raw)
+
+def run_blocking(func, *args):
+    """Run a blocking C-extension call without stalling the gevent hub"""
+    if GEVENT_ENABLED:
+        import gevent
+        return gevent.get_hub().threadpool.apply(func, args)
+    return func(*args)
+
+def read_system_metrics():
+    """Read the psutil system figures reported by /api/metrics"""
+    return {
+        'cpu_percent': psutil.cpu_percent(interval=None),
+        'memory_percent': psutil.virtual_memory().percent,
+        'disk_usage': psutil.disk_usage('/').percent
+    }
+
+class StaticRouteDispatcher:
+    """WSGI middleware serving fixed JSON GET routes from a path lookup"""
+    
+    def __init__(self, wsgi_app, routes, limiter, rate_limited_body, error_body,
+                 swallow_errors=False):
+        self.wsgi_app = wsgi_app
+        self.routes = routes
+        self.limiter = limiter
+        self.rate_limited_body = rate_limited_body
+        self.error_body = error_body
+        self.swallow_errors = swallow_errors
+    
+    def __call__(self, environ, start_response):
+        route = self.routes.get(environ.get('PATH_INFO'))
+        method = environ.get('REQUEST_METHOD')
+        if route is None or method not in ('GET', 'HEAD'):
+            return self.wsgi_app(environ, start_response)
+        
+        body_func, limit = route
+        status = '200 OK' if limit is None else self.check_limit(limit, environ)
+        if status == '200 OK':
+            body = body_func()
+        elif status == '429 Too Many Requests':
+            body = self.rate_limited_body.replace(b'__TS__', iso_now().encode())
+        else:
+            body = self.error_body.replace(b'__TS__', iso_now().encode())
+        start_response(status, [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body)))
+        ])
+        return [b''] if method == 'HEAD' else [body]
+    
+    def check_limit(self, limit, environ):
+        """Moving-window check keyed like get_remote_address, the app's key_func"""
+        if not self.limiter.enabled:
+            return '200 OK'
+        client = environ.get('REMOTE_ADDR') or '127.0.0.1'
+        try:
+            if self.limiter.limiter.hit(limit, environ['PATH_INFO'], client):
+                return '200 OK'
+            return '429 Too Many Requests'
+        except Exception:
+            # Storage errors (e.g. Redis down) are handled like Flask-Limiter
+            # does: let the request through when swallowing, else a JSON 500
+            if self.swallow_errors:
+                logger.exception("Failed to rate limit. Swallowing error")
+                return '200 OK'
+            logger.exception("Failed to rate limit")
+            return '500 INTERNAL SERVER ERROR'
+
 # Application factory pattern
 def create_app(config_name='default'):
     app = Flask(__name__)
@@ -34,216 +262,287 @@ def create_app(config_name='default'):
         'ENV': os.environ.get('FLASK_ENV', 'production'),
         'VERSION': '1.0.0',
         'BUILD_NUMBER': os.environ.get('BUILD_NUMBER', 'unknown'),
-        'GIT_COMMIT': os.environ.get('GIT_COMMIT', 'unknown')
+        'GIT_COMMIT': os.environ.get('GIT_COMMIT', 'unknown'),
+        'TRUSTED_PROXIES': int(os.environ.get('TRUSTED_PROXIES', 0)),
+        'RATELIMIT_STORAGE_URI': os.environ.get('RATELIMIT_STORAGE_URI', 'memory://'),
+        'RATELIMIT_STRATEGY': 'moving-window',
+        'COMPRESS_MIMETYPES': ['text/html', 'application/json'],
+        'COMPRESS_LEVEL': 4,
+        'MAX_CONTENT_LENGTH': 1 * 1024 * 1024
     })
+    app.config['REQUEST_LOGGING'] = os.environ.get(
+        'REQUEST_LOGGING', str(app.config['DEBUG'])).lower() == 'true'
     
-    # Request logging middleware
-    @app.before_request
-    def log_request_info():
-        logger.info(f"Request: {request.method} {request.url} - IP: {request.remote_addr}")
-        request.start_time = time.time()
+    # Prime psutil so later non-blocking cpu_percent() calls return a real value
+    if psutil is not None:
+        psutil.cpu_percent(interval=None)
     
-    @app.after_request
-    def log_response_info(response):
-        duration = time.time() - request.start_time
-        logger.info(f"Response: {response.status_code} - Duration: {duration:.3f}s")
-        return response
+    # Request logging middleware (gunicorn's access log covers production)
+    if app.config['REQUEST_LOGGING']:
+        @app.before_request
+        def log_request_info():
+            if not logger.isEnabledFor(logging.INFO):
+                return
+            logger.info("Request: %s %s - IP: %s", request.method, request.url, request.remote_addr)
+            request.start_time = time.monotonic()
+        
+        @app.after_request
+        def log_response_info(response):
+            start_time = getattr(request, 'start_time', None)
+            if start_time is None:
+                return response
+            duration = time.monotonic() - start_time
+            logger.info("Response: %s - Duration: %.3fs", response.status_code, duration)
+            return response
+    
+    # Error handlers: bodies are serialized once, only the timestamp is
+    # filled in per error
+    def error_body(error, message, status_code):
+        return json_bytes({
+            'error': error,
+            'message': message,
+            'status_code': status_code,
+            'timestamp': '__TS__'
+        })
+    
+    not_found_body = error_body('Not Found', 'The requested resource was not found', 404)
+    internal_error_body = error_body('Internal Server Error', 'An unexpected error occurred', 500)
+    payload_too_large_body = error_body(
+        'Payload Too Large', f"Request body exceeds {app.config['MAX_CONTENT_LENGTH']} bytes", 413)
+    rate_limit_body = error_body('Too Many Requests', 'Rate limit exceeded, retry later', 429)
     
-    # Error handlers
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({
-            'error': 'Not Found',
-            'message': 'The requested resource was not found',
-            'status_code': 404,
-            'timestamp': datetime.utcnow().isoformat()
-        }), 404
+        return timestamped_response(not_found_body, 404)
     
     @app.errorhandler(500)
     def internal_error(error):
-        logger.error(f"Internal server error: {error}")
-        return jsonify({
-            'error': 'Internal Server Error',
-            'message': 'An unexpected error occurred',
-            'status_code': 500,
-            'timestamp': datetime.utcnow().isoformat()
-        }), 500
-    
-    # Rate limiting decorator
+        logger.error("Internal server error: %s", error)
+        return timestamped_response(internal_error_body, 500)
+    
+    @app.errorhandler(413)
+    def payload_too_large(error):
+        return timestamped_response(payload_too_large_body, 413)
+    
+    @app.errorhandler(429)
+    def rate_limit_exceeded(error):
+        return timestamped_response(rate_limit_body, 429)
+    
+    # Rate limiting: moving window per client IP. With a redis:// storage URI
+    # each check is a single EVALSHA of a cached Lua script. Behind a reverse
+    # proxy the client IP comes from X-Forwarded-For, trusting only as many
+    # hops as TRUSTED_PROXIES
+    limiter = Limiter(get_remote_address, app=app)
+    
+    # Response compression (gzip/br) for HTML and JSON bodies
+    Compress(app)
+    
+    def limit_for(max_requests):
+        return f"{max_requests} per minute"
+    
     def rate_limit(max_requests=100):
-        def decorator(f):
-            @wraps(f)
-            def decorated_function(*args, **kwargs):
-                # Simple in-memory rate limiting (use Redis in production)
-                return f(*args, **kwargs)
-            return decorated_function
-        return decorator
+        return limiter.limit(limit_for(max_requests))
+    
+    version_max_requests = 1000
+    
+    # Config values read by the handlers never change after startup; bind
+    # them to closure locals instead of looking them up in app.config
+    version, env_name, build_number, git_commit, host, port, compress_level = (
+        app.config[key] for key in
+        ('VERSION', 'ENV', 'BUILD_NUMBER', 'GIT_COMMIT', 'HOST', 'PORT', 'COMPRESS_LEVEL')
+    )
+    
+    # The page is static apart from the current time: render it once here
+    # and splice the time in per request
+    home_html = _HOME_TEMPLATE.render(
+        version=version,
+        env=env_name,
+        current_time='__CURRENT_TIME__',
+        build_number=build_number,
+        git_commit=git_commit,
+        host=host,
+        port=port
+    )
+    home_html_prefix, home_html_suffix = home_html.split('__CURRENT_TIME__')
+    # The current time has second resolution, so the encoded and gzipped page
+    # is rebuilt at most once a second
+    home_cache = ('', b'', b'')
+    
+    # JSON bodies that do not change after startup are serialized once; the
+    # timestamp placeholder is swapped for the current time per request, and
+    # the /api/status mode flags for the live app.config values
+    health_body = json_bytes({
+        'status': 'healthy',
+        'timestamp': '__TS__',
+        'version': version
+    })
+    # Liveness probes hit /health constantly: reuse the body within a second
+    health_cache = ('', b'')
+    
+    def current_health_body():
+        nonlocal health_cache
+        timestamp, body = health_cache
+        now = iso_now()
+        if now != timestamp:
+            body = health_body.replace(b'__TS__', now.encode())
+            health_cache = (now, body)
+        return body
+    status_body = json_bytes({
+        'application': 'Flask CI/CD Demo',
+        'status': 'running',
+        'version': version,
+        'environment': env_name,
+        'build_number': build_number,
+        'git_commit': git_commit,
+        'timestamp': '__TS__',
+        'debug_mode': '__DEBUG__',
+        'testing_mode': '__TESTING__'
+    })
+    version_body = json_bytes({
+        'version': version,
+        'build_number': build_number,
+        'git_commit': git_commit,
+        'python_version': sys.version,
+        'flask_version': FLASK_VERSION
+    })
+    
+    # Serialized /api/metrics body and when it was read, per app instance
+    metrics_cache = (0, None)
     
     # Routes
     @app.route('/')
     @rate_limit(max_requests=1000)
     def home():
         """Home page with application information"""
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Flask CI/CD Demo App</title>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1">
-            <style>
-                body { font-family: Arial, sans-serif; margin: 40px; background-color: #f5f5f5; }
-                .container { max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-                .header { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
-                .info-box { background-color: #ecf0f1; padding: 15px; border-radius: 5px; margin: 10px 0; }
-                .status-ok { color: #27ae60; font-weight: bold; }
-                .build-info { background-color: #e8f4fd; border-left: 4px solid #3498db; padding: 10px; margin: 10px 0; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1 class="header">🚀 Flask CI/CD Demo Application</h1>
-                <div class="info-box">
-                    <h3>Application Status: <span class="status-ok">✅ RUNNING</span></h3>
-                    <p><strong>Version:</strong> {{ version }}</p>
-                    <p><strong>Environment:</strong> {{ env }}</p>
-                    <p><strong>Current Time:</strong> {{ current_time }}</p>
-                </div>
-                
-                <div class="build-info">
-                    <h4>Build Information</h4>
-                    <p><strong>Build Number:</strong> {{ build_number }}</p>
-                    <p><strong>Git Commit:</strong> {{ git_commit }}</p>
-                    <p><strong>Host:</strong> {{ host }}:{{ port }}</p>
-                </div>
-                
-                <h3>Available Endpoints:</h3>
-                <ul>
-                    <li><code>GET /</code> - This home page</li>
-                    <li><code>GET /health</code> - Health check endpoint</li>
-                    <li><code>GET /api/status</code> - Application status (JSON)</li>
-                    <li><code>GET /api/version</code> - Version information (JSON)</li>
-                    <li><code>POST /api/echo</code> - Echo service for testing</li>
-                    <li><code>GET /api/metrics</code> - Application metrics</li>
-                </ul>
-            </div>
-        </body>
-        </html>
-        """
+        nonlocal home_cache
+        second, html, html_gzip = home_cache
+        now = iso_now()
+        if now != second:
+            current_time = time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
+            html = (home_html_prefix + current_time + home_html_suffix).encode()
+            html_gzip = gzip.compress(html, compresslevel=compress_level)
+            home_cache = (now, html, html_gzip)
         
-        return render_template_string(html_template,
-            version=app.config['VERSION'],
-            env=app.config['ENV'],
-            current_time=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC'),
-            build_number=app.config['BUILD_NUMBER'],
-            git_commit=app.config['GIT_COMMIT'],
-            host=app.config['HOST'],
-            port=app.config['PORT']
-        )
+        if request.accept_encodings.quality('gzip') > 0:
+            # Already compressed, Flask-Compress leaves it alone
+            response = Response(html_gzip, mimetype='text/html')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(html, mimetype='text/html')
+        response.vary.add('Accept-Encoding')
+        return response
     
+    # GET/HEAD /health never reach this view (see StaticRouteDispatcher); it
+    # is registered so other methods get Flask's 405. Not rate limited, so a
+    # limiter storage outage cannot fail liveness probes
     @app.route('/health')
-    @rate_limit(max_requests=10000)
     def health_check():
         """Kubernetes/Docker health check endpoint"""
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.utcnow().isoformat(),
-            'version': app.config['VERSION'],
-            'uptime': 'Available'  # In production, track actual uptime
-        }), 200
+        return Response(current_health_body(), mimetype='application/json')
     
     @app.route('/api/status')
     @rate_limit(max_requests=1000)
     def api_status():
         """Detailed application status"""
-        return jsonify({
-            'application': 'Flask CI/CD Demo',
-            'status': 'running',
-            'version': app.config['VERSION'],
-            'environment': app.config['ENV'],
-            'build_number': app.config['BUILD_NUMBER'],
-            'git_commit': app.config['GIT_COMMIT'],
-            'timestamp': datetime.utcnow().isoformat(),
-            'debug_mode': app.config['DEBUG'],
-            'testing_mode': app.config['TESTING']
-        })
+        body = status_body.replace(
+            b'"__DEBUG__"', b'true' if app.config['DEBUG'] else b'false').replace(
+            b'"__TESTING__"', b'true' if app.config['TESTING'] else b'false')
+        return timestamped_response(body)
     
     @app.route('/api/version')
-    @rate_limit(max_requests=1000)
+    @rate_limit(max_requests=version_max_requests)
     def api_version():
         """Version information endpoint"""
-        return jsonify({
-            'version': app.config['VERSION'],
-            'build_number': app.config['BUILD_NUMBER'],
-            'git_commit': app.config['GIT_COMMIT'],
-            'python_version': os.sys.version,
-            'flask_version': Flask.__version__
-        })
+        return Response(version_body, mimetype='application/json')
     
     @app.route('/api/echo', methods=['POST'])
     @rate_limit(max_requests=100)
     def api_echo():
         """Echo service for testing POST requests"""
+        # Read outside the try block so an oversized body surfaces as a 413;
+        # cache=False avoids keeping a second copy on the request
+        raw = request.get_data(cache=False)
         try:
-            data = request.get_json() or {}
-            return jsonify({
+            # Non-JSON and falsy bodies (null, [], 0) echo as {} like the
+            # previous request.get_json() or {}
+            data = (parse_json(raw) if request.is_json and raw else None) or {}
+            # Only a few headers are echoed unless the caller asks for all of them
+            if request.args.get('include_headers') == '1':
+                headers = dict(request.headers)
+            else:
+                headers = {
+                    'content-type': request.content_type,
+                    'content-length': request.content_length,
+                    'user-agent': request.headers.get('User-Agent')
+                }
+            return json_response({
                 'echo': data,
-                'method': request.method,
                 'content_type': request.content_type,
-                'timestamp': datetime.utcnow().isoformat(),
-                'headers': dict(request.headers)
+                'timestamp': iso_now(),
+                'headers': headers
             })
         except Exception as e:
-            logger.error(f"Echo endpoint error: {e}")
-            return jsonify({'error': str(e)}), 400
+            logger.error("Echo endpoint error: %s", e)
+            return json_response({'error': str(e)}, 400)
     
     @app.route('/api/metrics')
     @rate_limit(max_requests=100)
     def api_metrics():
         """Application metrics endpoint"""
-        import psutil
-        import sys
+        nonlocal metrics_cache
+        now = time.monotonic()
+        cached_at, body = metrics_cache
+        if body is not None and now - cached_at < METRICS_TTL_SECONDS:
+            return Response(body, mimetype='application/json')
         
-        try:
-            return jsonify({
-                'system': {
-                    'cpu_percent': psutil.cpu_percent(),
-                    'memory_percent': psutil.virtual_memory().percent,
-                    'disk_usage': psutil.disk_usage('/').percent
-                },
+        if psutil is None:
+            # Fallback if psutil is not available
+            metrics = {
+                'system': 'metrics unavailable - psutil not installed',
                 'application': {
-                    'version': app.config['VERSION'],
-                    'environment': app.config['ENV'],
+                    'version': version,
+                    'environment': env_name,
                     'python_version': sys.version,
                     'process_id': os.getpid()
                 },
-                'timestamp': datetime.utcnow().isoformat()
-            })
-        except ImportError:
-            # Fallback if psutil is not available
-            return jsonify({
-                'system': 'metrics unavailable - psutil not installed',
+                'timestamp': iso_now()
+            }
+        else:
+            metrics = {
+                # All psutil reads in one threadpool round-trip under gevent
+                'system': run_blocking(read_system_metrics),
                 'application': {
-                    'version': app.config['VERSION'],
-                    'environment': app.config['ENV'],
+                    'version': version,
+                    'environment': env_name,
                     'python_version': sys.version,
                     'process_id': os.getpid()
                 },
-                'timestamp': datetime.utcnow().isoformat()
-            })
+                'timestamp': iso_now()
+            }
+        
+        body = json_bytes(metrics)
+        metrics_cache = (now, body)
+        return Response(body, mimetype='application/json')
+    
+    # GET /health and /api/version are answered straight from WSGI, without
+    # URL matching or the request hooks; /api/version keeps its rate limit,
+    # /health is exempt. Anything else (other methods included) goes
+    # through Flask
+    app.wsgi_app = StaticRouteDispatcher(app.wsgi_app, {
+        '/health': (current_health_body, None),
+        '/api/version': (lambda: version_body, parse_limit(limit_for(version_max_requests)))
+    }, limiter, rate_limit_body, internal_error_body,
+        swallow_errors=app.config.get('RATELIMIT_SWALLOW_ERRORS', False))
+    
+    if app.config['TRUSTED_PROXIES']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'])
     
     return app
 
-# Application instance
-app = create_app()
-
 if __name__ == '__main__':
-    port = app.config['PORT']
-    host = app.config['HOST']
-    debug = app.config['DEBUG']
-    
-    logger.info(f"Starting Flask application on {host}:{port}")
-    logger.info(f"Environment: {app.config['ENV']}")
-    logger.info(f"Debug mode: {debug}")
-    
-    app.run(host=host, port=port, debug=debug, threaded=True)
\ No newline at end of file
+    # Hand the process over to gunicorn before building an app here; the
+    # workers import app:app themselves
+    os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn_conf.py', 'app:app'])
+
+# Application instance (served by gunicorn as app:app)
+app = create_app()
@@ -12,6 +12,9 @@ FLASK_ENV=development
 # Enable/disable debug mode (true/false)
 FLASK_DEBUG=true
 
+# Log every request/response from the app (defaults to FLASK_DEBUG)
+REQUEST_LOGGING=true
+
 # Secret key for session management (generate a secure random key for production)
 SECRET_KEY=dev-secret-key-change-in-production-to-secure-random-string
 
@@ -24,6 +27,13 @@ BUILD_NUMBER=1
 GIT_COMMIT=unknown
 VERSION=1.0.0
 
+# Reverse proxies in front of the app whose X-Forwarded-For is trusted
+# (0 = none; set to 1 behind nginx so limits are keyed per real client)
+TRUSTED_PROXIES=0
+
+# Rate limit storage (memory:// per process, redis:// to share across workers)
+RATELIMIT_STORAGE_URI=memory://
+
 # ================================
 # Docker Configuration
 # ================================
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for Flask CI/CD Demo Application
+Usage: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+import multiprocessing
+
+# Server socket
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5000)}"
+backlog = 2048
+
+# Worker processes (gevent suits the I/O-bound endpoints of this app)
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gevent'
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 2))
+
+# Make app.py monkey-patch the stdlib before anything else is imported
+raw_env = ['GEVENT_MONKEY_PATCH=true']
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+loglevel = 'info'
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
+
+# Process naming
+proc_name = 'flask-cicd-demo'
+
+# Server mechanics
+daemon = False
+pidfile = '/tmp/gunicorn.pid'
+tmp_upload_dir = None
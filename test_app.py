@@ -5,6 +5,7 @@ Uses pytest framework for testing
 """
 
 import pytest
+import gzip
 import json
 import os
 import sys
@@ -15,20 +16,24 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app
 
+@pytest.fixture(scope='module')
+def app():
+    """Create one test application instance for every test class in the module"""
+    app = create_app('testing')
+    app.config.update({
+        'TESTING': True,
+        'DEBUG': False,
+        'SECRET_KEY': 'test-secret-key'
+    })
+    # Every test shares this app, so its rate-limit buckets would fill up
+    # across tests; limiting is only exercised on dedicated app instances
+    for limiter in app.extensions['limiter']:
+        limiter.enabled = False
+    return app
+
 class TestFlaskApplication:
     """Test suite for Flask application"""
     
-    @pytest.fixture
-    def app(self):
-        """Create test application instance"""
-        app = create_app('testing')
-        app.config.update({
-            'TESTING': True,
-            'DEBUG': False,
-            'SECRET_KEY': 'test-secret-key'
-        })
-        return app
-    
     @pytest.fixture
     def client(self, app):
         """Create test client"""
@@ -67,6 +72,20 @@ class TestHomeEndpoint(TestFlaskApplication):
         assert response.status_code == 200
         assert 'text/html' in response.content_type
 
+    def test_home_page_gzip(self, client):
+        """Test home page is served gzipped when the client accepts it"""
+        response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert b'Flask CI/CD Demo Application' in gzip.decompress(response.data)
+
+    def test_home_page_gzip_refused(self, client):
+        """Test home page is not gzipped when the client gives gzip q=0"""
+        response = client.get('/', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+        assert b'Flask CI/CD Demo Application' in response.data
+
 class TestHealthEndpoint(TestFlaskApplication):
     """Test health check functionality"""
     
@@ -114,6 +133,13 @@ class TestAPIEndpoints(TestFlaskApplication):
         assert data['status'] == 'running'
         assert data['version'] == '1.0.0'
     
+    def test_api_status_reflects_config(self, client):
+        """Test /api/status reports the current debug/testing config"""
+        response = client.get('/api/status')
+        data = json.loads(response.data)
+        assert data['testing_mode'] is True
+        assert data['debug_mode'] is False
+    
     def test_api_version_endpoint(self, client):
         """Test /api/version endpoint"""
         response = client.get('/api/version')
@@ -137,7 +163,30 @@ class TestAPIEndpoints(TestFlaskApplication):
         data = json.loads(response.data)
         assert 'echo' in data
         assert data['echo'] == test_data
-        assert data['method'] == 'POST'
+        assert 'method' not in data
+    
+    def test_api_echo_headers_subset(self, client):
+        """Test /api/echo only echoes selected headers by default"""
+        response = client.post('/api/echo',
+                             data='{}',
+                             content_type='application/json',
+                             headers={'X-Custom': 'value'})
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert set(data['headers']) == {'content-type', 'content-length', 'user-agent'}
+        assert data['headers']['content-type'] == 'application/json'
+    
+    def test_api_echo_include_headers(self, client):
+        """Test /api/echo echoes all headers when requested"""
+        response = client.post('/api/echo?include_headers=1',
+                             data='{}',
+                             content_type='application/json',
+                             headers={'X-Custom': 'value'})
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['headers']['X-Custom'] == 'value'
     
     def test_api_echo_post_empty_data(self, client):
         """Test /api/echo endpoint with empty data"""
@@ -150,6 +199,40 @@ class TestAPIEndpoints(TestFlaskApplication):
         assert 'echo' in data
         assert data['echo'] == {}
     
+    def test_api_echo_post_falsy_json(self, client):
+        """Test /api/echo echoes falsy JSON bodies as an empty object"""
+        for body in ('null', '[]', '0'):
+            response = client.post('/api/echo',
+                                 data=body,
+                                 content_type='application/json')
+            assert response.status_code == 200
+            assert json.loads(response.data)['echo'] == {}
+    
+    def test_api_echo_preserves_wide_integers(self, client):
+        """Test /api/echo keeps integers wider than 64 bits exact"""
+        response = client.post('/api/echo',
+                             data='{"big": 123456789012345678901234567890}',
+                             content_type='application/json')
+        assert response.status_code == 200
+        assert b'123456789012345678901234567890' in response.data
+    
+    def test_api_echo_preserves_negative_19_digit_integers(self, client):
+        """Test /api/echo keeps integers below the int64 range exact"""
+        response = client.post('/api/echo',
+                             data='{"a": -9223372036854775809}',
+                             content_type='application/json')
+        assert response.status_code == 200
+        assert b'-9223372036854775809' in response.data
+    
+    def test_api_echo_rejects_nan(self, client):
+        """Test /api/echo rejects NaN, also on the wide-integer path"""
+        for body in ('{"a": NaN}', '{"a": NaN, "b": 123456789012345678901}'):
+            response = client.post('/api/echo',
+                                 data=body,
+                                 content_type='application/json')
+            assert response.status_code == 400
+            assert 'error' in json.loads(response.data)
+    
     def test_api_echo_post_no_content_type(self, client):
         """Test /api/echo endpoint without content type"""
         response = client.post('/api/echo', data='test')
@@ -168,6 +251,15 @@ class TestAPIEndpoints(TestFlaskApplication):
         # System metrics might not be available in test environment
         assert data['application']['version'] == '1.0.0'
 
+    def test_api_metrics_cached_within_ttl(self, client):
+        """Test /api/metrics reuses its readings within the cache TTL"""
+        first = client.get('/api/metrics')
+        second = client.get('/api/metrics')
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.data == second.data
+        assert 'application/json' in second.content_type
+
 class TestErrorHandling(TestFlaskApplication):
     """Test error handling functionality"""
     
@@ -204,6 +296,17 @@ class TestSecurityAndValidation(TestFlaskApplication):
         data = json.loads(response.data)
         assert data['echo']['data'] == 'x' * 10000
     
+    def test_api_echo_rejects_oversized_payload(self, client):
+        """Test API echo rejects bodies over MAX_CONTENT_LENGTH"""
+        large_data = {'data': 'x' * (2 * 1024 * 1024)}  # 2MB of data
+        response = client.post('/api/echo',
+                             data=json.dumps(large_data),
+                             content_type='application/json')
+        
+        assert response.status_code == 413
+        data = json.loads(response.data)
+        assert data['status_code'] == 413
+    
     def test_api_echo_with_special_characters(self, client):
         """Test API echo with special characters"""
         test_data = {
@@ -219,6 +322,63 @@ class TestSecurityAndValidation(TestFlaskApplication):
         data = json.loads(response.data)
         assert data['echo'] == test_data
 
+    def test_api_echo_rate_limited(self):
+        """Test API echo rejects clients over the rate limit"""
+        # Own app instance so the exhausted limit does not leak into other tests
+        client = create_app('testing').test_client()
+        for _ in range(100):
+            response = client.post('/api/echo',
+                                 data='{}',
+                                 content_type='application/json')
+            assert response.status_code == 200
+        
+        response = client.post('/api/echo',
+                             data='{}',
+                             content_type='application/json')
+        assert response.status_code == 429
+        data = json.loads(response.data)
+        assert data['status_code'] == 429
+
+    def test_rate_limit_keyed_by_forwarded_client(self, monkeypatch):
+        """Test clients behind a trusted proxy get separate rate limits"""
+        monkeypatch.setenv('TRUSTED_PROXIES', '1')
+        client = create_app('testing').test_client()
+        for _ in range(100):
+            client.post('/api/echo', data='{}', content_type='application/json',
+                        headers={'X-Forwarded-For': '10.0.0.1'})
+        
+        response = client.post('/api/echo', data='{}', content_type='application/json',
+                               headers={'X-Forwarded-For': '10.0.0.1'})
+        assert response.status_code == 429
+        response = client.post('/api/echo', data='{}', content_type='application/json',
+                               headers={'X-Forwarded-For': '10.0.0.2'})
+        assert response.status_code == 200
+
+    def test_api_version_rate_limited(self):
+        """Test the WSGI fast path for /api/version still applies its rate limit"""
+        client = create_app('testing').test_client()
+        for _ in range(1000):
+            assert client.get('/api/version').status_code == 200
+        
+        response = client.get('/api/version')
+        assert response.status_code == 429
+        assert json.loads(response.data)['status_code'] == 429
+
+    def test_rate_limit_storage_error(self, monkeypatch):
+        """Test a limiter storage outage gives a JSON 500 but keeps /health up"""
+        app = create_app('testing')
+        limiter = next(iter(app.extensions['limiter']))
+        
+        def broken_hit(*args, **kwargs):
+            raise ConnectionError('storage down')
+        monkeypatch.setattr(limiter.limiter, 'hit', broken_hit)
+        client = app.test_client()
+        
+        response = client.get('/api/version')
+        assert response.status_code == 500
+        assert json.loads(response.data)['status_code'] == 500
+        assert client.get('/health').status_code == 200
+
 class TestApplicationConfiguration(TestFlaskApplication):
     """Test application configuration"""
     
@@ -315,6 +475,14 @@ def test_environment_variables():
     assert app.config['PORT'] == 5000
     assert app.config['HOST'] == '0.0.0.0'
 
+def test_metrics_cache_per_app(monkeypatch):
+    """Test cached metrics are not shared between app instances"""
+    create_app().test_client().get('/api/metrics')
+    monkeypatch.setenv('FLASK_ENV', 'staging')
+    response = create_app().test_client().get('/api/metrics')
+    data = json.loads(response.data)
+    assert data['application']['environment'] == 'staging'
+
 def test_application_factory():
     """Test application factory pattern"""
     app1 = create_app('testing')